@@ -29,22 +29,36 @@ for logger in ["langchain_mcp_adapters", "httpx", "httpcore", "mcp"]:
 warnings.filterwarnings("ignore")
 
 
-class StderrFilter(io.StringIO):
+class StderrFilter(io.TextIOBase):
     """Filter noisy stderr messages."""
     
     SUPPRESS = ["Session termination failed", "LangGraphDeprecated"]
+    _SUPPRESS_RE = re.compile("|".join(map(re.escape, SUPPRESS)))
     
     def __init__(self, original):
         super().__init__()
         self.original = original
     
+    @property
+    def encoding(self):
+        return self.original.encoding
+    
     def write(self, msg):
-        if not any(p in msg for p in self.SUPPRESS):
+        if not self._SUPPRESS_RE.search(msg):
             self.original.write(msg)
         return len(msg)
     
     def flush(self):
         self.original.flush()
+    
+    def writable(self):
+        return True
+    
+    def isatty(self):
+        return self.original.isatty()
+    
+    def fileno(self):
+        return self.original.fileno()
 
 
 LOGO = """
@@ -74,7 +88,7 @@ ARCADE_API_KEY = os.getenv("ARCADE_API_KEY")
 ARCADE_USER_ID = os.getenv("ARCADE_USER_EMAIL")
 
 # Tools we want to use
-ALLOWED_TOOLS = [
+ALLOWED_TOOLS = frozenset({
     "BaseballDugout_GetPlayerStats",
     "BaseballDugout_GetTeamStats", 
     "BaseballDugout_ComparePlayers",
@@ -82,38 +96,65 @@ ALLOWED_TOOLS = [
     "BaseballDugout_ExecuteBaseballQuery",
     "GoogleDocs_CreateDocumentFromText",
     "Gmail_SendEmail",
-]
+})
+
+# URL patterns, compiled once at import
+_AUTH_URL_RE = re.compile(
+    r'https://accounts\.google\.com/o/oauth2[^\s\)\]\"\'<>]+'
+    r'|https://[^\s\)\]\"\'<>]*oauth[^\s\)\]\"\'<>]*',
+    re.IGNORECASE,
+)
+_DOC_RE = re.compile(r'https://docs\.google\.com/document/d/[^\s\)\]\"\'<>]+')
+
+# Agent instructions, filled in per player by analyze_player
+_PROMPT_TEMPLATE = """You are a baseball data analyst. ONLY use the provided tools to get information.
+DO NOT use any prior knowledge - ALL data must come from tool calls.
+
+Task: Research and share analysis for baseball player "{player_name}"
+
+Follow these steps IN ORDER:
+
+1. RESEARCH: Use BaseballDugout_GetPlayerStats with player_name "{player_name}" to get their career stats
+
+2. CREATE DOCUMENT: Use GoogleDocs_CreateDocumentFromText to create a document with:
+   - title: "Baseball Scouting Report: {player_name}"  
+   - text_content: A nicely formatted report with all their stats, career highlights, and key achievements
+
+3. SEND EMAIL: Use Gmail_SendEmail to share the document:
+   - recipient: "{recipient_email}"
+   - subject: "Baseball Scouting Report: {player_name}"
+   - body: A brief message saying you've completed the analysis with a link to the Google Doc
+
+4. Return a summary of what was done and the Google Doc URL.
+
+If player not found, say "Player not found in database."
+"""
 
 
 def extract_auth_url(text: str) -> str | None:
     """Extract OAuth URL from response text."""
-    pattern = r'https://accounts\.google\.com/o/oauth2[^\s\)\]\"\'<>]+'
-    matches = re.findall(pattern, text)
-    if matches:
-        return matches[0]
-    
-    pattern = r'https://[^\s\)\]\"\'<>]*oauth[^\s\)\]\"\'<>]*'
-    matches = re.findall(pattern, text, re.IGNORECASE)
-    if matches:
-        return matches[0]
-    
-    return None
+    match = _AUTH_URL_RE.search(text)
+    return match.group() if match else None
+
+
+_STEP_PREFIX = {
+    "running": "    \033[33m⏳\033[0m ",
+    "done": "    \033[32m✓\033[0m ",
+    "error": "    \033[31m✗\033[0m ",
+    "auth": "    \033[35m🔐\033[0m ",
+}
 
 
 def print_step(step: str, status: str = "running"):
     """Print a formatted step."""
-    icons = {
-        "running": "\033[33m⏳\033[0m",
-        "done": "\033[32m✓\033[0m",
-        "error": "\033[31m✗\033[0m",
-        "auth": "\033[35m🔐\033[0m",
-    }
-    icon = icons.get(status, "•")
-    print(f"    {icon} {step}")
-
-
-async def analyze_player(player_name: str, recipient_email: str) -> str:
-    """Connect to Arcade MCP Gateway and analyze a baseball player."""
+    sys.stdout.write(_STEP_PREFIX.get(status, "    • "))
+    sys.stdout.write(step)
+    sys.stdout.write("\n")
+    sys.stdout.flush()
+
+
+async def load_tools() -> list:
+    """Connect to Arcade MCP Gateway and fetch the allowed tools."""
     
     # Validate config
     if not all([MCP_SERVER_URL, ARCADE_API_KEY, ARCADE_USER_ID, os.getenv("OPENAI_API_KEY")]):
@@ -139,39 +180,24 @@ async def analyze_player(player_name: str, recipient_email: str) -> str:
     
     print(f"\033[90m    Tools loaded: {len(tools)}\033[0m\n")
     
+    return tools
+
+
+async def analyze_player(player_name: str, recipient_email: str, tools: list) -> str:
+    """Analyze a baseball player with the given Arcade tools."""
+    
     # Create agent
     agent = create_react_agent(ChatOpenAI(model="gpt-4o"), tools)
     
     # Build the query
-    query = f"""You are a baseball data analyst. ONLY use the provided tools to get information.
-DO NOT use any prior knowledge - ALL data must come from tool calls.
-
-Task: Research and share analysis for baseball player "{player_name}"
-
-Follow these steps IN ORDER:
-
-1. RESEARCH: Use BaseballDugout_GetPlayerStats with player_name "{player_name}" to get their career stats
-
-2. CREATE DOCUMENT: Use GoogleDocs_CreateDocumentFromText to create a document with:
-   - title: "Baseball Scouting Report: {player_name}"  
-   - text_content: A nicely formatted report with all their stats, career highlights, and key achievements
-
-3. SEND EMAIL: Use Gmail_SendEmail to share the document:
-   - recipient: "{recipient_email}"
-   - subject: "Baseball Scouting Report: {player_name}"
-   - body: A brief message saying you've completed the analysis with a link to the Google Doc
-
-4. Return a summary of what was done and the Google Doc URL.
-
-If player not found, say "Player not found in database."
-"""
+    query = _PROMPT_TEMPLATE.format(player_name=player_name, recipient_email=recipient_email)
     
     print("\033[1m    WORKFLOW PROGRESS\033[0m")
     print("    " + "─" * 50)
     
     max_retries = 3
     for attempt in range(max_retries):
-        full_response = ""
+        chunks: list[str] = []
         current_tool = ""
         
         async for event in agent.astream_events(
@@ -198,7 +224,9 @@ If player not found, say "Player not found in database."
             elif kind == "on_chat_model_stream":
                 chunk = event.get("data", {}).get("chunk")
                 if chunk and hasattr(chunk, "content") and chunk.content:
-                    full_response += chunk.content
+                    chunks.append(chunk.content)
+        
+        full_response = "".join(chunks)
         
         # Check if auth is required
         auth_url = extract_auth_url(full_response)
@@ -253,14 +281,15 @@ async def main() -> None:
         print("\n    \033[31mNo email provided. Exiting.\033[0m\n")
         return
     
-    result = await analyze_player(player_name, recipient_email)
+    tools = await load_tools()
+    result = await analyze_player(player_name, recipient_email, tools)
     
     print()
     print("\033[1m\033[32m    ✓ SCOUTING COMPLETE\033[0m")
     print("    " + "─" * 50)
     
     # Extract and display the Google Doc URL if present
-    doc_match = re.search(r'https://docs\.google\.com/document/d/[^\s\)\]\"\'<>]+', result)
+    doc_match = _DOC_RE.search(result)
     if doc_match:
         print(f"\n    \033[1mGoogle Doc:\033[0m")
         print(f"    \033[4m\033[36m{doc_match.group()}\033[0m")
@@ -270,4 +299,11 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop is a faster drop-in event loop; fall back to asyncio where it is
+    # unavailable (e.g. Windows)
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
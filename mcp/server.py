@@ -7,12 +7,15 @@ This MCP server provides baseball analytics tools backed by Snowflake.
 Deploy to Arcade Cloud for secure, governed access to baseball data.
 """
 
-import json
+import asyncio
+import hashlib
 import re
 import sys
+import time
 from typing import Annotated, Optional
 
 import httpx
+import orjson
 from arcade_mcp_server import Context, MCPApp
 
 # ============================================================================
@@ -29,11 +32,14 @@ app = MCPApp(
 # Input Validation
 # ============================================================================
 
+_SANITIZE_RE = re.compile(r"[^a-zA-Z0-9_\- ]")
+
+
 def sanitize_identifier(value: str) -> str:
     """Sanitize string input to prevent SQL injection."""
     if not value:
         return ""
-    sanitized = re.sub(r"[^a-zA-Z0-9_\- ]", "", value)
+    sanitized = _SANITIZE_RE.sub("", value)
     return sanitized[:100]
 
 
@@ -48,8 +54,36 @@ def validate_year(year: int) -> int:
 # Snowflake REST SQL API Client
 # ============================================================================
 
+# Snowflake error code returned when a session token has expired
+SESSION_EXPIRED_CODE = "390112"
+
+# The baseball tables are static reference data, so parsed query results are
+# cached in-process keyed by a digest of (account, SQL text, bound values)
+RESULT_CACHE_TTL = 3600.0
+RESULT_CACHE_MAX_ENTRIES = 512
+_RESULT_CACHE: dict[bytes, tuple[float, tuple[list[str], list[list]]]] = {}
+
+# Results larger than these are (de)serialized in a worker thread so one big
+# result set doesn't stall other tool calls sharing the event loop
+OFFLOAD_THRESHOLD_BYTES = 1 << 20
+OFFLOAD_THRESHOLD_CELLS = 50_000
+
+
+async def _decode_json(content: bytes) -> dict:
+    if len(content) > OFFLOAD_THRESHOLD_BYTES:
+        return await asyncio.to_thread(orjson.loads, content)
+    return orjson.loads(content)
+
+
 class SnowflakeClient:
-    """Lightweight Snowflake client using REST SQL API."""
+    """Lightweight Snowflake client using REST SQL API.
+
+    Instances hold a persistent async HTTP connection pool and cache the session
+    token until it expires, so repeated queries skip the login round-trip.
+    """
+    
+    # Refresh the session token this many seconds before Snowflake expires it
+    TOKEN_EXPIRY_MARGIN = 60.0
     
     def __init__(self, account: str, user: str, password: str, 
                  warehouse: str = "BASEBALL_WAREHOUSE", 
@@ -62,16 +96,31 @@ class SnowflakeClient:
         self.database = database
         self.schema = schema
         self._token = None
+        self._token_expiry = 0.0
+        self._login_lock = asyncio.Lock()
+        # HTTP/2 lets concurrent queries multiplex over one TLS connection
+        self._http = httpx.AsyncClient(
+            timeout=60.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0),
+            http2=True,
+        )
     
     @property
     def base_url(self) -> str:
         account = self.account.replace("_", "-")
         return f"https://{account}.snowflakecomputing.com"
     
-    def _get_token(self) -> str:
-        if self._token:
+    async def _get_token(self) -> str:
+        if self._token and time.monotonic() < self._token_expiry:
             return self._token
         
+        # Concurrent queries share a single login instead of racing each other
+        async with self._login_lock:
+            if self._token and time.monotonic() < self._token_expiry:
+                return self._token
+            return await self._login()
+    
+    async def _login(self) -> str:
         login_url = f"{self.base_url}/session/v1/login-request"
         payload = {
             "data": {
@@ -83,53 +132,125 @@ class SnowflakeClient:
             }
         }
         
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(login_url, json=payload, headers={"Content-Type": "application/json"})
-            
-            if response.status_code >= 400:
-                raise RuntimeError(f"Snowflake login HTTP error {response.status_code}: {response.text[:300]}")
-            
-            data = response.json()
-            
-            if not data.get("success"):
-                raise RuntimeError(f"Snowflake login failed: {data.get('message', 'Unknown error')}")
-            
-            self._token = data["data"]["token"]
-            return self._token
+        response = await self._http.post(login_url, json=payload, headers={"Content-Type": "application/json"}, timeout=30.0)
+        
+        if response.status_code >= 400:
+            raise RuntimeError(f"Snowflake login HTTP error {response.status_code}: {response.text[:300]}")
+        
+        data = orjson.loads(response.content)
+        
+        if not data.get("success"):
+            raise RuntimeError(f"Snowflake login failed: {data.get('message', 'Unknown error')}")
+        
+        validity = float(data["data"].get("validityInSeconds") or 3600)
+        self._token = data["data"]["token"]
+        self._token_expiry = time.monotonic() + validity - self.TOKEN_EXPIRY_MARGIN
+        return self._token
     
-    def execute_query(self, sql: str) -> list[dict]:
-        token = self._get_token()
-        sql_url = f"{self.base_url}/queries"
+    def _invalidate_token(self) -> None:
+        self._token = None
+        self._token_expiry = 0.0
+    
+    async def execute_query(self, sql: str, params: tuple = (), use_cache: bool = True) -> list[dict]:
+        """Run a query and return its rows as dicts keyed by column name."""
+        columns, rows = await self.execute_rows(sql, params, use_cache=use_cache)
+        return [dict(zip(columns, row)) for row in rows]
+    
+    async def execute_rows(self, sql: str, params: tuple = (), use_cache: bool = True) -> tuple[list[str], list[list]]:
+        """Run a query and return (columns, rows) as Snowflake sent them.
         
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Snowflake Token=\"{token}\"",
-            "Accept": "application/json",
-        }
+        ``params`` are bound to the ``?`` placeholders in ``sql`` in order, so
+        statements that differ only in their values share one compiled plan.
+        Repeats are served from the result cache; cached rows are shared
+        between callers and must not be mutated.
+        """
+        if not use_cache:
+            return await self._run_query(sql, params)
+        
+        key = hashlib.blake2b(f"{self.account}\0{sql}\0{params!r}".encode()).digest()
+        cached = _RESULT_CACHE.get(key)
+        if cached and time.monotonic() < cached[0]:
+            return cached[1]
+        
+        results = await self._run_query(sql, params)
+        
+        _RESULT_CACHE.pop(key, None)
+        if len(_RESULT_CACHE) >= RESULT_CACHE_MAX_ENTRIES:
+            # Dicts keep insertion order, so the first key is the oldest entry
+            del _RESULT_CACHE[next(iter(_RESULT_CACHE))]
+        _RESULT_CACHE[key] = (time.monotonic() + RESULT_CACHE_TTL, results)
+        return results
+    
+    async def _run_query(self, sql: str, params: tuple) -> tuple[list[str], list[list]]:
+        sql_url = f"{self.base_url}/queries"
+        payload = {"sqlText": sql}
+        if params:
+            payload["bindings"] = self._bindings(params)
         
-        with httpx.Client(timeout=60.0) as client:
-            response = client.post(sql_url, json={"sqlText": sql}, headers=headers)
+        for attempt in range(2):
+            token = await self._get_token()
+            headers = {
+                "Content-Type": "application/json",
+                "Authorization": f"Snowflake Token=\"{token}\"",
+                "Accept": "application/json",
+            }
+            
+            response = await self._http.post(sql_url, json=payload, headers=headers)
+            
+            # Session expired or revoked: log in again and retry once
+            if response.status_code == 401 and attempt == 0:
+                self._invalidate_token()
+                continue
             
             if response.status_code >= 400:
                 error_detail = response.text[:500]
                 raise RuntimeError(f"Snowflake API error {response.status_code}: {error_detail}")
             
-            data = response.json()
+            data = await _decode_json(response.content)
             if not data.get("success"):
+                if data.get("code") == SESSION_EXPIRED_CODE and attempt == 0:
+                    self._invalidate_token()
+                    continue
                 raise RuntimeError(f"Snowflake query failed: {data.get('message', 'Unknown error')}")
             
             return self._parse_response(data)
-    
-    def _parse_response(self, data: dict) -> list[dict]:
+        
+        raise RuntimeError("Snowflake session could not be re-established")
+    
+    @staticmethod
+    def _bindings(params: tuple) -> dict:
+        bindings = {}
+        for i, value in enumerate(params, 1):
+            if isinstance(value, bool):
+                bind_type = "BOOLEAN"
+            elif isinstance(value, int):
+                bind_type = "FIXED"
+            elif isinstance(value, float):
+                bind_type = "REAL"
+            else:
+                bind_type = "TEXT"
+            bindings[str(i)] = {"type": bind_type, "value": str(value)}
+        return bindings
+    
+    def _parse_response(self, data: dict) -> tuple[list[str], list[list]]:
         result_data = data.get("data", {})
         row_type = result_data.get("rowtype", [])
         columns = [col.get("name", f"col_{i}") for i, col in enumerate(row_type)]
         rows = result_data.get("rowset", [])
-        return [dict(zip(columns, row)) for row in rows]
+        return columns, rows
+
+
+# Built on first use and kept for the server's lifetime, so secrets are read
+# once and the session token and connection pool survive across tool calls
+_CLIENT: Optional[SnowflakeClient] = None
 
 
 def get_snowflake_client(context: Context) -> SnowflakeClient:
-    """Create Snowflake client using secrets from Arcade context."""
+    """Return the shared Snowflake client, creating it from Arcade secrets on first use."""
+    global _CLIENT
+    if _CLIENT is not None:
+        return _CLIENT
+    
     account = context.get_secret("SNOWFLAKE_ACCOUNT")
     user = context.get_secret("SNOWFLAKE_USER")
     password = context.get_secret("SNOWFLAKE_PASSWORD")
@@ -137,7 +258,7 @@ def get_snowflake_client(context: Context) -> SnowflakeClient:
     if not all([account, user, password]):
         raise ValueError("Missing Snowflake credentials in Arcade secrets")
     
-    return SnowflakeClient(
+    _CLIENT = SnowflakeClient(
         account=account,
         user=user,
         password=password,
@@ -145,6 +266,7 @@ def get_snowflake_client(context: Context) -> SnowflakeClient:
         database="BASEBALL_ANALYTICS",
         schema="PLAYER_DATA"
     )
+    return _CLIENT
 
 
 # ============================================================================
@@ -152,7 +274,7 @@ def get_snowflake_client(context: Context) -> SnowflakeClient:
 # ============================================================================
 
 @app.tool(requires_secrets=["SNOWFLAKE_ACCOUNT", "SNOWFLAKE_USER", "SNOWFLAKE_PASSWORD"])
-def execute_baseball_query(
+async def execute_baseball_query(
     context: Context,
     query: Annotated[str, "SQL query to execute against the baseball database"],
     explanation: Annotated[str, "Brief explanation of what this query is looking for"] = "",
@@ -166,20 +288,32 @@ def execute_baseball_query(
     e.g., BASEBALL_ANALYTICS.PLAYER_DATA.MASTER
     
     Key columns: player_id links players across tables, year_id for seasons.
+    
+    Results are returned as {"columns": [...], "rows": [[...], ...]}.
     """
+    if not query.strip():
+        return "No query provided."
+    
     client = get_snowflake_client(context)
-    results = client.execute_query(query)
-    return json.dumps(results, indent=2, default=str)
+    # Ad-hoc results are unbounded in size, so keep them out of the result cache
+    columns, rows = await client.execute_rows(query, use_cache=False)
+    result = {"columns": columns, "rows": rows}
+    if len(rows) * len(columns) > OFFLOAD_THRESHOLD_CELLS:
+        return (await asyncio.to_thread(orjson.dumps, result, default=str)).decode()
+    return orjson.dumps(result, default=str).decode()
 
 
 @app.tool(requires_secrets=["SNOWFLAKE_ACCOUNT", "SNOWFLAKE_USER", "SNOWFLAKE_PASSWORD"])
-def get_player_stats(
+async def get_player_stats(
     context: Context,
     player_name: Annotated[str, "Player name to search for (e.g., 'Babe Ruth', 'Ted Williams', 'David Ortiz')"],
 ) -> Annotated[str, "Career statistics for the player"]:
     """Get career batting and pitching statistics for a baseball player."""
     
     player_name = sanitize_identifier(player_name)
+    if not player_name.strip():
+        return "No player name provided."
+    
     client = get_snowflake_client(context)
     
     # Find player by name
@@ -187,81 +321,78 @@ def get_player_stats(
     if len(name_parts) >= 2:
         first_name = name_parts[0]
         last_name = " ".join(name_parts[1:])
-        name_filter = f"LOWER(name_first) LIKE LOWER('%{first_name}%') AND LOWER(name_last) LIKE LOWER('%{last_name}%')"
+        name_filter = "LOWER(name_first) LIKE LOWER(?) AND LOWER(name_last) LIKE LOWER(?)"
+        params = (f"%{first_name}%", f"%{last_name}%")
     else:
-        name_filter = f"LOWER(name_last) LIKE LOWER('%{player_name}%') OR LOWER(name_first) LIKE LOWER('%{player_name}%')"
-    
-    # Get player info
-    player_query = f"""
-    SELECT player_id, name_first, name_last, birth_year, birth_country, 
-           bats, throws, debut, final_game
-    FROM BASEBALL_ANALYTICS.PLAYER_DATA.MASTER 
-    WHERE {name_filter}
-    LIMIT 1
+        name_filter = "(LOWER(name_last) LIKE LOWER(?) OR LOWER(name_first) LIKE LOWER(?))"
+        params = (f"%{player_name}%", f"%{player_name}%")
+    
+    # Resolve the player and compute every aggregate in a single round-trip.
+    # Aggregates without GROUP BY always yield one row, so the cross joins
+    # never drop the player.
+    stats_query = f"""
+    WITH p AS (
+        SELECT player_id, name_first, name_last, birth_year, birth_country, 
+               bats, throws, debut, final_game
+        FROM BASEBALL_ANALYTICS.PLAYER_DATA.MASTER 
+        WHERE {name_filter}
+        ORDER BY player_id
+        LIMIT 1
+    ),
+    bat AS (
+        SELECT 
+            COUNT(DISTINCT year_id) as bat_seasons,
+            SUM(g) as bat_games,
+            SUM(ab) as at_bats,
+            SUM(h) as hits,
+            SUM(hr) as home_runs,
+            SUM(rbi) as rbis,
+            SUM(r) as runs,
+            SUM(bb) as walks,
+            SUM(so) as bat_strikeouts,
+            SUM(sb) as stolen_bases,
+            ROUND(SUM(h)::FLOAT / NULLIF(SUM(ab), 0), 3) as batting_avg
+        FROM BASEBALL_ANALYTICS.PLAYER_DATA.BATTING
+        WHERE player_id = (SELECT player_id FROM p)
+    ),
+    pit AS (
+        SELECT 
+            COUNT(DISTINCT year_id) as pit_seasons,
+            SUM(w) as wins,
+            SUM(l) as losses,
+            SUM(g) as pit_games,
+            SUM(gs) as starts,
+            SUM(sv) as saves,
+            SUM(so) as pit_strikeouts,
+            ROUND(9.0 * SUM(er) / NULLIF(SUM(ip_outs) / 3.0, 0), 2) as career_era
+        FROM BASEBALL_ANALYTICS.PLAYER_DATA.PITCHING
+        WHERE player_id = (SELECT player_id FROM p)
+    ),
+    allstar AS (
+        SELECT COUNT(*) as allstar_appearances
+        FROM BASEBALL_ANALYTICS.PLAYER_DATA.ALLSTARFULL
+        WHERE player_id = (SELECT player_id FROM p)
+    ),
+    hof AS (
+        SELECT MIN(year_id) as hof_year
+        FROM BASEBALL_ANALYTICS.PLAYER_DATA.HALLOFFAME
+        WHERE player_id = (SELECT player_id FROM p) AND inducted = 'Y'
+    )
+    SELECT p.*, bat.*, pit.*, allstar.*, hof.*
+    FROM p
+    CROSS JOIN bat
+    CROSS JOIN pit
+    CROSS JOIN allstar
+    CROSS JOIN hof
     """
-    players = client.execute_query(player_query)
+    players = await client.execute_query(stats_query, params)
     
     if not players:
         return f"No player found matching: {player_name}"
     
     p = players[0]
-    player_id = p.get('PLAYER_ID')
-    
-    # Get batting stats
-    batting_query = f"""
-    SELECT 
-        COUNT(DISTINCT year_id) as seasons,
-        SUM(g) as games,
-        SUM(ab) as at_bats,
-        SUM(h) as hits,
-        SUM(hr) as home_runs,
-        SUM(rbi) as rbis,
-        SUM(r) as runs,
-        SUM(bb) as walks,
-        SUM(so) as strikeouts,
-        SUM(sb) as stolen_bases,
-        ROUND(SUM(h)::FLOAT / NULLIF(SUM(ab), 0), 3) as batting_avg
-    FROM BASEBALL_ANALYTICS.PLAYER_DATA.BATTING
-    WHERE player_id = '{player_id}'
-    """
-    batting = client.execute_query(batting_query)
-    b = batting[0] if batting else {}
-    
-    # Get pitching stats
-    pitching_query = f"""
-    SELECT 
-        COUNT(DISTINCT year_id) as seasons,
-        SUM(w) as wins,
-        SUM(l) as losses,
-        SUM(g) as games,
-        SUM(gs) as starts,
-        SUM(sv) as saves,
-        SUM(so) as strikeouts,
-        ROUND(AVG(era), 2) as career_era
-    FROM BASEBALL_ANALYTICS.PLAYER_DATA.PITCHING
-    WHERE player_id = '{player_id}'
-    """
-    pitching = client.execute_query(pitching_query)
-    pit = pitching[0] if pitching else {}
-    
-    # Get All-Star appearances
-    allstar_query = f"""
-    SELECT COUNT(*) as appearances
-    FROM BASEBALL_ANALYTICS.PLAYER_DATA.ALLSTARFULL
-    WHERE player_id = '{player_id}'
-    """
-    allstar = client.execute_query(allstar_query)
-    allstar_count = allstar[0].get('APPEARANCES', 0) if allstar else 0
-    
-    # Get Hall of Fame status
-    hof_query = f"""
-    SELECT inducted, year_id
-    FROM BASEBALL_ANALYTICS.PLAYER_DATA.HALLOFFAME
-    WHERE player_id = '{player_id}' AND inducted = 'Y'
-    LIMIT 1
-    """
-    hof = client.execute_query(hof_query)
-    hof_status = f"Inducted {hof[0].get('YEAR_ID')}" if hof else "Not in Hall of Fame"
+    allstar_count = p.get('ALLSTAR_APPEARANCES') or 0
+    hof_status = f"Inducted {p.get('HOF_YEAR')}" if p.get('HOF_YEAR') else "Not in Hall of Fame"
     
     output = f"""
 # {p.get('NAME_FIRST', '')} {p.get('NAME_LAST', '')} ⚾
@@ -273,40 +404,40 @@ def get_player_stats(
 **Hall of Fame:** {hof_status}
 """
     
-    if b.get('GAMES') and int(b.get('GAMES') or 0) > 0:
+    if int(p.get('BAT_GAMES') or 0) > 0:
         output += f"""
 ## Batting Statistics
 | Stat | Value |
 |------|-------|
-| Seasons | {b.get('SEASONS', 0)} |
-| Games | {b.get('GAMES', 0)} |
-| At Bats | {b.get('AT_BATS', 0)} |
-| Hits | {b.get('HITS', 0)} |
-| Home Runs | {b.get('HOME_RUNS', 0)} |
-| RBIs | {b.get('RBIS', 0)} |
-| Batting Avg | {b.get('BATTING_AVG', '.000')} |
-| Stolen Bases | {b.get('STOLEN_BASES', 0)} |
+| Seasons | {p.get('BAT_SEASONS', 0)} |
+| Games | {p.get('BAT_GAMES', 0)} |
+| At Bats | {p.get('AT_BATS', 0)} |
+| Hits | {p.get('HITS', 0)} |
+| Home Runs | {p.get('HOME_RUNS', 0)} |
+| RBIs | {p.get('RBIS', 0)} |
+| Batting Avg | {p.get('BATTING_AVG', '.000')} |
+| Stolen Bases | {p.get('STOLEN_BASES', 0)} |
 """
     
-    if pit.get('GAMES') and int(pit.get('GAMES') or 0) > 0:
+    if int(p.get('PIT_GAMES') or 0) > 0:
         output += f"""
 ## Pitching Statistics
 | Stat | Value |
 |------|-------|
-| Seasons | {pit.get('SEASONS', 0)} |
-| W-L | {pit.get('WINS', 0)}-{pit.get('LOSSES', 0)} |
-| Games | {pit.get('GAMES', 0)} |
-| Starts | {pit.get('STARTS', 0)} |
-| Saves | {pit.get('SAVES', 0)} |
-| Strikeouts | {pit.get('STRIKEOUTS', 0)} |
-| ERA | {pit.get('CAREER_ERA', '0.00')} |
+| Seasons | {p.get('PIT_SEASONS', 0)} |
+| W-L | {p.get('WINS', 0)}-{p.get('LOSSES', 0)} |
+| Games | {p.get('PIT_GAMES', 0)} |
+| Starts | {p.get('STARTS', 0)} |
+| Saves | {p.get('SAVES', 0)} |
+| Strikeouts | {p.get('PIT_STRIKEOUTS', 0)} |
+| ERA | {p.get('CAREER_ERA', '0.00')} |
 """
     
     return output
 
 
 @app.tool(requires_secrets=["SNOWFLAKE_ACCOUNT", "SNOWFLAKE_USER", "SNOWFLAKE_PASSWORD"])
-def get_team_stats(
+async def get_team_stats(
     context: Context,
     team_name: Annotated[str, "Team name or ID (e.g., 'Yankees', 'NYA', 'Cubs', 'CHC')"],
     year: Annotated[Optional[int], "Optional: Filter to specific year"] = None,
@@ -314,48 +445,66 @@ def get_team_stats(
     """Get statistics and history for a baseball team."""
     
     team_name = sanitize_identifier(team_name)
-    client = get_snowflake_client(context)
+    if not team_name.strip():
+        return "No team name provided."
+    
+    params = (f"%{team_name}%", team_name, f"%{team_name}%")
+    year_filter = ""
+    if year:
+        year_filter = "AND t.year_id = ?"
+        params += (validate_year(year),)
     
-    year_filter = f"AND t.year_id = {validate_year(year)}" if year else ""
+    client = get_snowflake_client(context)
     
-    # Find team
+    # Resolve the team, its history and its five most recent seasons in one
+    # round-trip; team and history columns repeat on every recent-season row.
     team_query = f"""
-    SELECT t.team_id, t.name, tf.franch_name, MAX(t.year_id) as latest_year
-    FROM BASEBALL_ANALYTICS.PLAYER_DATA.TEAMS t
-    LEFT JOIN BASEBALL_ANALYTICS.PLAYER_DATA.TEAMS_FRANCHISES tf ON t.franch_id = tf.franch_id
-    WHERE LOWER(t.name) LIKE LOWER('%{team_name}%') 
-       OR LOWER(t.team_id) = LOWER('{team_name}')
-       OR LOWER(tf.franch_name) LIKE LOWER('%{team_name}%')
-    GROUP BY t.team_id, t.name, tf.franch_name
-    ORDER BY latest_year DESC
-    LIMIT 1
+    WITH team AS (
+        SELECT t.team_id, t.name, tf.franch_name, t.year_id as latest_year
+        FROM BASEBALL_ANALYTICS.PLAYER_DATA.TEAMS t
+        LEFT JOIN BASEBALL_ANALYTICS.PLAYER_DATA.TEAMS_FRANCHISES tf ON t.franch_id = tf.franch_id
+        WHERE LOWER(t.name) LIKE LOWER(?) 
+           OR LOWER(t.team_id) = LOWER(?)
+           OR LOWER(tf.franch_name) LIKE LOWER(?)
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY t.team_id ORDER BY t.year_id DESC) = 1
+        ORDER BY latest_year DESC, t.team_id
+        LIMIT 1
+    ),
+    history AS (
+        SELECT 
+            MIN(year_id) as first_year,
+            MAX(year_id) as last_year,
+            COUNT(*) as seasons,
+            SUM(w) as total_wins,
+            SUM(l) as total_losses,
+            SUM(CASE WHEN ws_win = 'Y' THEN 1 ELSE 0 END) as world_series_wins,
+            SUM(CASE WHEN lg_win = 'Y' THEN 1 ELSE 0 END) as pennants
+        FROM BASEBALL_ANALYTICS.PLAYER_DATA.TEAMS t
+        WHERE t.team_id = (SELECT team_id FROM team) {year_filter}
+    ),
+    recent AS (
+        SELECT team_id, year_id, w, l, rank, ws_win, lg_win
+        FROM BASEBALL_ANALYTICS.PLAYER_DATA.TEAMS
+        WHERE team_id = (SELECT team_id FROM team)
+        QUALIFY ROW_NUMBER() OVER (ORDER BY year_id DESC) <= 5
+    )
+    SELECT team.team_id, team.name, team.franch_name, history.*,
+           recent.year_id, recent.w, recent.l, recent.rank, recent.ws_win, recent.lg_win
+    FROM team
+    CROSS JOIN history
+    LEFT JOIN recent ON recent.team_id = team.team_id
+    ORDER BY recent.year_id DESC
     """
-    teams = client.execute_query(team_query)
+    rows = await client.execute_query(team_query, params)
     
-    if not teams:
+    if not rows:
         return f"No team found matching: {team_name}"
     
-    team = teams[0]
+    team = rows[0]
     team_id = team.get('TEAM_ID')
     
-    # Get team history
-    stats_query = f"""
-    SELECT 
-        MIN(year_id) as first_year,
-        MAX(year_id) as last_year,
-        COUNT(*) as seasons,
-        SUM(w) as total_wins,
-        SUM(l) as total_losses,
-        SUM(CASE WHEN ws_win = 'Y' THEN 1 ELSE 0 END) as world_series_wins,
-        SUM(CASE WHEN lg_win = 'Y' THEN 1 ELSE 0 END) as pennants
-    FROM BASEBALL_ANALYTICS.PLAYER_DATA.TEAMS t
-    WHERE t.team_id = '{team_id}' {year_filter}
-    """
-    stats = client.execute_query(stats_query)
-    s = stats[0] if stats else {}
-    
-    total_wins = int(s.get('TOTAL_WINS') or 0)
-    total_losses = int(s.get('TOTAL_LOSSES') or 0)
+    total_wins = int(team.get('TOTAL_WINS') or 0)
+    total_losses = int(team.get('TOTAL_LOSSES') or 0)
     win_pct = total_wins / (total_wins + total_losses) if (total_wins + total_losses) > 0 else 0
     
     output = f"""
@@ -367,23 +516,16 @@ def get_team_stats(
 ## Franchise History
 | Stat | Value |
 |------|-------|
-| First Season | {s.get('FIRST_YEAR', 'N/A')} |
-| Most Recent | {s.get('LAST_YEAR', 'N/A')} |
-| Total Seasons | {s.get('SEASONS', 0)} |
+| First Season | {team.get('FIRST_YEAR', 'N/A')} |
+| Most Recent | {team.get('LAST_YEAR', 'N/A')} |
+| Total Seasons | {team.get('SEASONS', 0)} |
 | All-Time Record | {total_wins}-{total_losses} (.{int(win_pct*1000):03d}) |
-| World Series Titles | {s.get('WORLD_SERIES_WINS', 0)} 🏆 |
-| Pennants | {s.get('PENNANTS', 0)} |
+| World Series Titles | {team.get('WORLD_SERIES_WINS', 0)} 🏆 |
+| Pennants | {team.get('PENNANTS', 0)} |
 """
     
-    # Get recent seasons
-    recent_query = f"""
-    SELECT year_id, w, l, rank, ws_win, lg_win
-    FROM BASEBALL_ANALYTICS.PLAYER_DATA.TEAMS
-    WHERE team_id = '{team_id}'
-    ORDER BY year_id DESC
-    LIMIT 5
-    """
-    recent = client.execute_query(recent_query)
+    # Recent seasons come back as the individual rows of the result
+    recent = [r for r in rows if r.get('YEAR_ID') is not None]
     
     if recent:
         output += "\n## Recent Seasons\n| Year | W | L | Rank | WS |\n|------|---|---|------|----|\n"
@@ -395,7 +537,7 @@ def get_team_stats(
 
 
 @app.tool(requires_secrets=["SNOWFLAKE_ACCOUNT", "SNOWFLAKE_USER", "SNOWFLAKE_PASSWORD"])
-def compare_players(
+async def compare_players(
     context: Context,
     player1_name: Annotated[str, "First player name (e.g., 'Ted Williams')"],
     player2_name: Annotated[str, "Second player name (e.g., 'Joe DiMaggio')"],
@@ -404,16 +546,21 @@ def compare_players(
     
     player1_name = sanitize_identifier(player1_name)
     player2_name = sanitize_identifier(player2_name)
+    if not player1_name.strip() or not player2_name.strip():
+        return "Two player names are required."
+    
     client = get_snowflake_client(context)
     
-    def get_player_data(name: str) -> dict:
+    async def get_player_data(name: str) -> dict:
         name_parts = name.split()
         if len(name_parts) >= 2:
             first_name = name_parts[0]
             last_name = " ".join(name_parts[1:])
-            name_filter = f"LOWER(name_first) LIKE LOWER('%{first_name}%') AND LOWER(name_last) LIKE LOWER('%{last_name}%')"
+            name_filter = "LOWER(name_first) LIKE LOWER(?) AND LOWER(name_last) LIKE LOWER(?)"
+            params = (f"%{first_name}%", f"%{last_name}%")
         else:
-            name_filter = f"LOWER(name_last) LIKE LOWER('%{name}%')"
+            name_filter = "LOWER(name_last) LIKE LOWER(?)"
+            params = (f"%{name}%",)
         
         player_query = f"""
         SELECT m.player_id, m.name_first, m.name_last,
@@ -426,11 +573,10 @@ def compare_players(
         GROUP BY m.player_id, m.name_first, m.name_last
         LIMIT 1
         """
-        result = client.execute_query(player_query)
+        result = await client.execute_query(player_query, params)
         return result[0] if result else {}
     
-    p1 = get_player_data(player1_name)
-    p2 = get_player_data(player2_name)
+    p1, p2 = await asyncio.gather(get_player_data(player1_name), get_player_data(player2_name))
     
     if not p1:
         return f"Player not found: {player1_name}"
@@ -455,7 +601,7 @@ def compare_players(
 
 
 @app.tool(requires_secrets=["SNOWFLAKE_ACCOUNT", "SNOWFLAKE_USER", "SNOWFLAKE_PASSWORD"])
-def get_season_leaders(
+async def get_season_leaders(
     context: Context,
     year: Annotated[int, "Season year (e.g., 2020)"],
     stat: Annotated[str, "Statistic to rank by: 'hr' (home runs), 'avg' (batting average), 'rbi', 'wins', 'era', 'strikeouts'"],
@@ -464,7 +610,6 @@ def get_season_leaders(
     
     year = validate_year(year)
     stat = sanitize_identifier(stat).lower()
-    client = get_snowflake_client(context)
     
     stat_configs = {
         'hr': ('SUM(b.hr)', 'Home Runs', 'DESC', 'batting'),
@@ -472,7 +617,7 @@ def get_season_leaders(
         'rbi': ('SUM(b.rbi)', 'RBIs', 'DESC', 'batting'),
         'hits': ('SUM(b.h)', 'Hits', 'DESC', 'batting'),
         'wins': ('SUM(p.w)', 'Wins', 'DESC', 'pitching'),
-        'era': ('ROUND(AVG(p.era), 2)', 'ERA', 'ASC', 'pitching'),
+        'era': ('ROUND(9.0 * SUM(p.er) / NULLIF(SUM(p.ip_outs) / 3.0, 0), 2)', 'ERA', 'ASC', 'pitching'),
         'strikeouts': ('SUM(p.so)', 'Strikeouts', 'DESC', 'pitching'),
     }
     
@@ -480,6 +625,7 @@ def get_season_leaders(
         return f"Unknown stat: {stat}. Available: hr, avg, rbi, hits, wins, era, strikeouts"
     
     calc, label, order, table = stat_configs[stat]
+    client = get_snowflake_client(context)
     
     if table == 'batting':
         query = f"""
@@ -488,7 +634,7 @@ def get_season_leaders(
                {calc} as value
         FROM BASEBALL_ANALYTICS.PLAYER_DATA.BATTING b
         JOIN BASEBALL_ANALYTICS.PLAYER_DATA.MASTER m ON b.player_id = m.player_id
-        WHERE b.year_id = {year} AND b.ab >= 100
+        WHERE b.year_id = ? AND b.ab >= 100
         GROUP BY m.player_id, m.name_first, m.name_last, b.team_id
         ORDER BY value {order}
         LIMIT 10
@@ -500,13 +646,13 @@ def get_season_leaders(
                {calc} as value
         FROM BASEBALL_ANALYTICS.PLAYER_DATA.PITCHING p
         JOIN BASEBALL_ANALYTICS.PLAYER_DATA.MASTER m ON p.player_id = m.player_id
-        WHERE p.year_id = {year} AND p.ip_outs >= 150
+        WHERE p.year_id = ? AND p.ip_outs >= 150
         GROUP BY m.player_id, m.name_first, m.name_last, p.team_id
         ORDER BY value {order}
         LIMIT 10
         """
     
-    results = client.execute_query(query)
+    results = await client.execute_query(query, (year,))
     
     output = f"# {year} {label} Leaders ⚾\n\n| Rank | Player | Team | {label} |\n|------|--------|------|--------|\n"
     for i, r in enumerate(results, 1):